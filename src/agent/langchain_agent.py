@@ -1,5 +1,5 @@
 """LangChain agent for natural language query interpretation."""
-import json
+import orjson
 import logging
 from typing import Dict, Any
 
@@ -60,13 +60,13 @@ class TorrentSearchAgent:
             
             # Try to extract JSON
             try:
-                parsed = json.loads(content)
-            except json.JSONDecodeError:
+                parsed = orjson.loads(content)
+            except orjson.JSONDecodeError:
                 # Try to find JSON in the response
                 import re
                 json_match = re.search(r'\{[^}]*\}', content, re.DOTALL)
                 if json_match:
-                    parsed = json.loads(json_match.group())
+                    parsed = orjson.loads(json_match.group())
                 else:
                     # Fallback: use the query as-is
                     logger.warning(f"Could not parse JSON from LLM response: {content}")
@@ -1,5 +1,5 @@
 """AI-powered title parser using Gemini to extract clean movie/TV show names."""
-import json
+import orjson
 import logging
 import re
 from typing import Optional, Dict, Any
@@ -121,17 +121,17 @@ def extract_title_with_ai(torrent_name: str, torrent_hash: Optional[str] = None)
         # Try to extract JSON
         parsed = None
         try:
-            parsed = json.loads(content)
+            parsed = orjson.loads(content)
             logger.debug("Successfully parsed AI response as JSON")
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             # Try to find JSON in the response
             logger.debug("Direct JSON parse failed, searching for JSON in response...")
             json_match = re.search(r'\{[^}]*\}', content, re.DOTALL)
             if json_match:
                 try:
-                    parsed = json.loads(json_match.group())
+                    parsed = orjson.loads(json_match.group())
                     logger.debug("Found and parsed JSON from response")
-                except json.JSONDecodeError as e:
+                except orjson.JSONDecodeError as e:
                     logger.warning(f"Could not parse extracted JSON: {e}")
             else:
                 logger.warning(f"Could not find JSON in AI response. Full response: {content}")
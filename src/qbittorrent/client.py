@@ -1,4 +1,5 @@
 """qBittorrent API client."""
+import hashlib
 import logging
 import re
 import time
@@ -11,6 +12,55 @@ from src.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Info-hash in magnet links: 40-char hex or 32-char base32 form
+_MAGNET_BTIH = re.compile(r'btih:([a-fA-F0-9]{40}|[A-Z2-7]{32})')
+
+# States considered "active" (downloading or seeding) by get_active_torrents
+_ACTIVE_STATES = frozenset({
+    'downloading', 'seeding', 'uploading', 'stalledUP',
+    'stalledDL', 'forcedDL', 'forcedUP'
+})
+
+
+def _bencoded_end(data: bytes, idx: int) -> int:
+    """Return the index just past the bencoded value starting at idx."""
+    c = data[idx:idx + 1]
+    if c == b'i':
+        return data.index(b'e', idx) + 1
+    if c in (b'l', b'd'):
+        idx += 1
+        while data[idx:idx + 1] != b'e':
+            idx = _bencoded_end(data, idx)
+        return idx + 1
+    # String: <length>:<bytes>
+    colon = data.index(b':', idx)
+    return colon + 1 + int(data[idx:colon])
+
+
+def _torrent_info_hash(data: bytes) -> Optional[str]:
+    """
+    Compute the info-hash of raw .torrent file contents.
+
+    Locates the bencoded ``info`` dict by byte scanning and hashes the
+    raw slice in one shot, avoiding a bencode decode/encode round-trip.
+
+    Args:
+        data: Raw bytes of a .torrent file
+
+    Returns:
+        Lowercase hex info-hash or None if the info dict can't be found
+    """
+    marker = data.find(b'4:info')
+    if marker == -1:
+        return None
+    start = marker + len(b'4:info')
+    try:
+        end = _bencoded_end(data, start)
+    except (ValueError, IndexError):
+        return None
+    # One-shot constructor so hashlib can use the fastest OpenSSL backend
+    return hashlib.sha1(data[start:end], usedforsecurity=False).hexdigest()
+
 
 class QBittorrentClient:
     """Client for interacting with qBittorrent API."""
@@ -20,9 +70,14 @@ class QBittorrentClient:
         self.client = Client(
             host=settings.qbittorrent_url,
             username=settings.qbittorrent_username,
-            password=settings.qbittorrent_password
+            password=settings.qbittorrent_password,
+            SIMPLE_RESPONSES=True
         )
         self._authenticated = False
+        # Lazily created session for the raw WebAPI fallback in
+        # set_torrent_options; kept on the instance so repeated fallback
+        # calls reuse one pooled connection and login cookie
+        self._raw_session: Optional[requests.Session] = None
     
     def connect(self) -> bool:
         """
@@ -40,13 +95,13 @@ class QBittorrentClient:
             # logger.info("Successfully connected to qBittorrent")
             return True
         except LoginFailed as e:
-            logger.error(f"qBittorrent login failed: {e}")
+            logger.error("qBittorrent login failed: %s", e)
             return False
         except APIConnectionError as e:
-            logger.error(f"qBittorrent connection error: {e}")
+            logger.error("qBittorrent connection error: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error connecting to qBittorrent: {e}")
+            logger.error("Unexpected error connecting to qBittorrent: %s", e)
             return False
     
     def add_torrent(self, torrent_link: str, category: Optional[str] = None) -> bool:
@@ -67,44 +122,71 @@ class QBittorrentClient:
                 return False
         
         try:
+            # Determine the info-hash up front when the link is a magnet
+            torrent_hash = None
+            if torrent_link.startswith("magnet:"):
+                match = _MAGNET_BTIH.search(torrent_link)
+                if match:
+                    torrent_hash = match.group(1).lower()
+            elif torrent_link.startswith(("http://", "https://")) and ".torrent" in torrent_link.lower():
+                # Download the .torrent file and hash its info dict locally
+                try:
+                    response = requests.get(torrent_link, timeout=10)
+                    response.raise_for_status()
+                    torrent_hash = _torrent_info_hash(response.content)
+                except Exception as e:
+                    logger.debug("Could not compute info-hash from .torrent URL: %s", e)
+
+            # Idempotent add: if qBittorrent already has this hash, skip the
+            # add entirely and just make sure the download options are set
+            if torrent_hash:
+                try:
+                    existing = self.client.torrents_info(torrent_hashes=torrent_hash)
+                    if existing:
+                        logger.info("Torrent already exists, skipping add: %.8s...", torrent_hash)
+                        torrent = existing[0]
+                        if not (torrent.get('seq_dl') and torrent.get('f_l_piece_prio')):
+                            self.set_torrent_options(
+                                torrent_hash=torrent_hash,
+                                sequential_download=True,
+                                first_last_piece_priority=True
+                            )
+                        return True
+                except Exception as e:
+                    logger.debug("Could not check for existing torrent: %s", e)
+
             # Get existing torrent hashes before adding
             existing_hashes = set()
             try:
                 existing_torrents = self.client.torrents_info()
-                existing_hashes = {t.hash for t in existing_torrents}
+                existing_hashes = {t['hash'] for t in existing_torrents}
             except Exception as e:
-                logger.warning(f"Could not get existing torrents to find new hash: {e}")
-            
+                logger.warning("Could not get existing torrents to find new hash: %s", e)
+
             # Add torrent via API
             self.client.torrents_add(
                 urls=torrent_link,
                 category=category,
                 is_paused=False
             )
-            logger.info(f"Successfully added torrent: {torrent_link[:50]}...")
+            logger.info("Successfully added torrent: %.50s...", torrent_link)
             
-            # Get the hash of the newly added torrent
-            torrent_hash = None
-            try:
-                # Wait a moment for qBittorrent to process the new torrent
-                time.sleep(0.5)  # Small delay to ensure torrent is processed
-                
-                # Get all torrents and find the new one
-                all_torrents = self.client.torrents_info()
-                for torrent in all_torrents:
-                    if torrent.hash not in existing_hashes:
-                        torrent_hash = torrent.hash
-                        break
-                
-                # If we couldn't find it by hash comparison, try extracting from magnet link
-                if not torrent_hash and torrent_link.startswith("magnet:"):
-                    # Extract hash from magnet link: magnet:?xt=urn:btih:HASH&...
-                    match = re.search(r'btih:([a-fA-F0-9]{40})', torrent_link)
-                    if match:
-                        torrent_hash = match.group(1).lower()
-                
-            except Exception as e:
-                logger.warning(f"Could not determine torrent hash after adding: {e}")
+            # Get the hash of the newly added torrent (unless we already
+            # extracted it from the magnet link above)
+            if not torrent_hash:
+                try:
+                    # Wait a moment for qBittorrent to process the new torrent
+                    time.sleep(0.5)  # Small delay to ensure torrent is processed
+
+                    # Get all torrents and find the new one
+                    all_torrents = self.client.torrents_info()
+                    for torrent in all_torrents:
+                        if torrent['hash'] not in existing_hashes:
+                            torrent_hash = torrent['hash']
+                            break
+
+                except Exception as e:
+                    logger.warning("Could not determine torrent hash after adding: %s", e)
             
             # Apply sequential download and first/last piece priority settings
             if torrent_hash:
@@ -116,13 +198,13 @@ class QBittorrentClient:
                     )
                 except Exception as e:
                     # Log warning but don't fail the torrent addition
-                    logger.warning(f"Failed to set sequential download options for torrent {torrent_hash[:8]}...: {e}")
+                    logger.warning("Failed to set sequential download options for torrent %.8s...: %s", torrent_hash, e)
             else:
                 logger.warning("Could not determine torrent hash, skipping sequential download configuration")
             
             return True
         except Exception as e:
-            logger.error(f"Failed to add torrent: {e}")
+            logger.error("Failed to add torrent: %s", e)
             return False
     
     def get_torrent_info(self, torrent_hash: Optional[str] = None) -> Optional[dict]:
@@ -142,14 +224,39 @@ class QBittorrentClient:
         try:
             if torrent_hash:
                 torrents = self.client.torrents_info(torrent_hashes=torrent_hash)
-                return dict(torrents[0]) if torrents else None
+                return torrents[0] if torrents else None
             else:
-                torrents = self.client.torrents_info()
-                return [dict(t) for t in torrents]
+                # SIMPLE_RESPONSES makes the API return plain dicts already
+                return self.client.torrents_info()
         except Exception as e:
-            logger.error(f"Failed to get torrent info: {e}")
+            logger.error("Failed to get torrent info: %s", e)
             return None
     
+    def sync_maindata(self, rid: int = 0) -> Optional[dict]:
+        """
+        Fetch incremental state from qBittorrent's sync API.
+
+        /api/v2/sync/maindata returns only what changed since the given
+        response ID, so pollers transfer deltas instead of re-enumerating
+        every torrent on each call.
+
+        Args:
+            rid: Response ID from the previous call (0 requests a full update)
+
+        Returns:
+            Maindata dictionary ('rid', 'torrents', 'torrents_removed',
+            'full_update', ...) or None if error
+        """
+        if not self._authenticated:
+            if not self.connect():
+                return None
+
+        try:
+            return self.client.sync_maindata(rid=rid)
+        except Exception as e:
+            logger.error("Failed to sync maindata: %s", e)
+            return None
+
     def get_active_torrents(self) -> Optional[List[dict]]:
         """
         Get active torrents (downloading and seeding, excluding queued).
@@ -164,15 +271,13 @@ class QBittorrentClient:
         try:
             torrents = self.client.torrents_info()
             # Filter to only downloading and seeding torrents
-            # Seeding states: 'uploading', 'stalledUP', 'queuedUP'
-            # Downloading states: 'downloading', 'stalledDL', 'queuedDL'
             active_torrents = [
-                dict(t) for t in torrents 
-                if t.state in ['downloading', 'seeding', 'uploading', 'stalledUP']
+                t for t in torrents
+                if t['state'] in _ACTIVE_STATES
             ]
             return active_torrents
         except Exception as e:
-            logger.error(f"Failed to get active torrents: {e}")
+            logger.error("Failed to get active torrents: %s", e)
             return None
     
     def pause_torrent(self, torrent_hash: str) -> bool:
@@ -191,10 +296,10 @@ class QBittorrentClient:
         
         try:
             self.client.torrents_pause(torrent_hashes=torrent_hash)
-            logger.info(f"Successfully paused torrent: {torrent_hash[:8]}...")
+            logger.info("Successfully paused torrent: %.8s...", torrent_hash)
             return True
         except Exception as e:
-            logger.error(f"Failed to pause torrent: {e}")
+            logger.error("Failed to pause torrent: %s", e)
             return False
     
     def resume_torrent(self, torrent_hash: str) -> bool:
@@ -213,10 +318,10 @@ class QBittorrentClient:
         
         try:
             self.client.torrents_resume(torrent_hashes=torrent_hash)
-            logger.info(f"Successfully resumed torrent: {torrent_hash[:8]}...")
+            logger.info("Successfully resumed torrent: %.8s...", torrent_hash)
             return True
         except Exception as e:
-            logger.error(f"Failed to resume torrent: {e}")
+            logger.error("Failed to resume torrent: %s", e)
             return False
     
     def delete_torrent(self, torrent_hash: str, delete_files: bool = False) -> bool:
@@ -239,10 +344,10 @@ class QBittorrentClient:
                 torrent_hashes=torrent_hash,
                 delete_files=delete_files
             )
-            logger.info(f"Successfully deleted torrent: {torrent_hash[:8]}...")
+            logger.info("Successfully deleted torrent: %.8s...", torrent_hash)
             return True
         except Exception as e:
-            logger.error(f"Failed to delete torrent: {e}")
+            logger.error("Failed to delete torrent: %s", e)
             return False
     
     def get_torrent_files(self, torrent_hash: str) -> Optional[List[dict]]:
@@ -260,10 +365,10 @@ class QBittorrentClient:
                 return None
         
         try:
-            files = self.client.torrents_files(torrent_hash=torrent_hash)
-            return [dict(f) for f in files]
+            # Plain list of dicts thanks to SIMPLE_RESPONSES
+            return self.client.torrents_files(torrent_hash=torrent_hash)
         except Exception as e:
-            logger.error(f"Failed to get torrent files: {e}")
+            logger.error("Failed to get torrent files: %s", e)
             return None
     
     def set_file_priority(self, torrent_hash: str, file_ids: List[int], priority: int) -> bool:
@@ -290,10 +395,10 @@ class QBittorrentClient:
                 file_ids=file_ids_str,
                 priority=priority
             )
-            logger.info(f"Successfully set file priority for torrent: {torrent_hash[:8]}...")
+            logger.info("Successfully set file priority for torrent: %.8s...", torrent_hash)
             return True
         except Exception as e:
-            logger.error(f"Failed to set file priority: {e}")
+            logger.error("Failed to set file priority: %s", e)
             return False
     
     def set_torrent_options(self, torrent_hash: str, sequential_download: bool = True, first_last_piece_priority: bool = True) -> bool:
@@ -332,16 +437,21 @@ class QBittorrentClient:
                 # qBittorrent API endpoint: POST /api/v2/torrents/setOptions
                 base_url = settings.qbittorrent_url.rstrip('/')
                 api_url = f"{base_url}/api/v2/torrents/setOptions"
-                
-                # Create a session and login
-                session = requests.Session()
-                login_url = f"{base_url}/api/v2/auth/login"
-                login_data = {
-                    'username': settings.qbittorrent_username,
-                    'password': settings.qbittorrent_password
-                }
-                session.post(login_url, data=login_data)
-                
+
+                # Reuse one session across fallback calls - a fresh
+                # Session per call would pay the TCP handshake and login
+                # round-trip every time
+                session = self._raw_session
+                if session is None:
+                    session = requests.Session()
+                    login_url = f"{base_url}/api/v2/auth/login"
+                    login_data = {
+                        'username': settings.qbittorrent_username,
+                        'password': settings.qbittorrent_password
+                    }
+                    session.post(login_url, data=login_data)
+                    self._raw_session = session
+
                 # Set torrent options
                 data = {
                     'hashes': torrent_hash,
@@ -351,10 +461,10 @@ class QBittorrentClient:
                 response = session.post(api_url, data=data)
                 response.raise_for_status()
             
-            logger.info(f"Successfully set torrent options (sequential={sequential_download}, firstLastPrio={first_last_piece_priority}) for torrent: {torrent_hash[:8]}...")
+            logger.info("Successfully set torrent options (sequential=%s, firstLastPrio=%s) for torrent: %.8s...", sequential_download, first_last_piece_priority, torrent_hash)
             return True
         except Exception as e:
-            logger.error(f"Failed to set torrent options: {e}")
+            logger.error("Failed to set torrent options: %s", e)
             return False
     
     def disconnect(self):
@@ -364,4 +474,4 @@ class QBittorrentClient:
                 self.client.auth_log_out()
                 self._authenticated = False
         except Exception as e:
-            logger.warning(f"Error during disconnect: {e}")
+            logger.warning("Error during disconnect: %s", e)
@@ -1,17 +1,47 @@
 """Rutracker.org scraper with custom implementation."""
+import re
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Optional
 from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter, Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import html as lxml_html
 
 from src.config.settings import settings
 from src.scrapers.models import TorrentResult
 
 logger = logging.getLogger(__name__)
 
+# Magnet URI embedded in topic pages / inline scripts
+_MAGNET_RE = re.compile(r'magnet:\?[^\s"\']+')
+# Bytes variant for scanning raw response bodies without an HTML parse
+_MAGNET_RE_BYTES = re.compile(rb'magnet:\?[^\s"\'<>]+')
+# Error/alert div text on the login page, extracted without a full parse
+_LOGIN_ERROR_RE = re.compile(rb'class="(?:error|alert)"[^>]*>([^<]+)<')
+# Size text like "2.5 GB" / "700 МБ" - one match beats per-unit scans
+_UNIT_RE = re.compile(r'\d+(?:\.\d+)?\s*(?:GB|MB|KB|TB|ГБ|МБ|КБ|ТБ)', re.I)
+
+# SoupStrainers keep the remaining bs4 parses down to just the elements
+# each caller actually inspects instead of building the whole DOM
+_FORM_STRAINER = SoupStrainer("form")
+_LINK_STRAINER = SoupStrainer("a")
+_LINK_SCRIPT_STRAINER = SoupStrainer(["a", "script"])
+
+
+def _parse_html(response, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Parse an HTTP response with the C-backed lxml parser.
+
+    Passing raw bytes lets lxml pick up the charset from the document
+    itself and skips requests' slower text decoding. A SoupStrainer
+    limits the built tree to the elements the caller cares about.
+    """
+    return BeautifulSoup(response.content, "lxml", parse_only=parse_only)
+
 
 class RutrackerScraper:
     """Scraper for rutracker.org torrent site."""
@@ -19,6 +49,9 @@ class RutrackerScraper:
     BASE_URL = "https://rutracker.org"
     LOGIN_URL = "https://rutracker.org/forum/login.php"
     SEARCH_URL = "https://rutracker.org/forum/tracker.php"
+
+    MAGNET_CACHE_TTL = 3600  # seconds
+    MAGNET_CACHE_MAX = 4096  # entries
     
     def __init__(self):
         """Initialize scraper with session."""
@@ -32,7 +65,23 @@ class RutrackerScraper:
             "Connection": "keep-alive",
             "Upgrade-Insecure-Requests": "1"
         })
+        # Larger keep-alive pool so concurrent magnet fetches reuse
+        # connections instead of paying a TCP+TLS handshake each
+        adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=16,
+            pool_block=False,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self._authenticated = False
+        # topic_id -> (monotonic timestamp, magnet link)
+        self._magnet_cache = {}
     
     def login(self) -> bool:
         """
@@ -51,7 +100,7 @@ class RutrackerScraper:
             login_page.raise_for_status()
             
             # Parse login form
-            soup = BeautifulSoup(login_page.text, "html.parser")
+            soup = _parse_html(login_page, parse_only=_FORM_STRAINER)
             
             # Find login form - rutracker uses different form names
             login_form = soup.find("form", {"name": "login"}) or soup.find("form", action=lambda x: x and "login.php" in x)
@@ -84,11 +133,18 @@ class RutrackerScraper:
                 logger.info("Successfully logged in to rutracker.org")
                 return True
             else:
-                # Check for error messages
-                soup = response.content and BeautifulSoup(response.text, "html.parser")
-                error_msg = soup.find("div", class_="error") or soup.find("div", class_="alert")
-                if error_msg:
-                    logger.error(f"Login error: {error_msg.get_text(strip=True)}")
+                # Check for error messages with a cheap bytes scan instead
+                # of parsing the whole page just to log one string
+                content = response.content
+                if b'class="error"' in content or b'class="alert"' in content:
+                    error_msg = _LOGIN_ERROR_RE.search(content)
+                    if error_msg:
+                        logger.error(
+                            "Login error: %s",
+                            error_msg.group(1).decode(response.encoding or "utf-8", "replace").strip()
+                        )
+                    else:
+                        logger.error("Login failed - check credentials")
                 else:
                     logger.error("Login failed - check credentials")
                 return False
@@ -136,9 +192,8 @@ class RutrackerScraper:
             )
             response.raise_for_status()
             
-            # Parse results
-            soup = BeautifulSoup(response.text, "html.parser")
-            results = self._parse_search_results(soup, max_results)
+            # Parse results with raw lxml - the row loop is the hot path
+            results = self._parse_search_results(response.content, max_results)
             
             logger.info(f"Found {len(results)} torrents for query: {query}")
             return results
@@ -150,131 +205,191 @@ class RutrackerScraper:
             logger.error(f"Unexpected error during search: {e}", exc_info=True)
             return []
     
-    def _parse_search_results(self, soup: BeautifulSoup, max_results: int) -> List[TorrentResult]:
+    def _parse_search_results(self, content: bytes, max_results: int) -> List[TorrentResult]:
         """
         Parse HTML search results into TorrentResult objects.
-        
+
         Args:
-            soup: BeautifulSoup object of search results page
+            content: Raw bytes of the search results page
             max_results: Maximum number of results to return
-            
+
         Returns:
             List of TorrentResult objects
         """
         results = []
-        
+
         try:
-            # Find the results table - rutracker uses specific table classes
-            results_table = soup.find("table", {"class": "forumline"}) or \
-                          soup.find("table", {"id": "tor-tbl"}) or \
-                          soup.find("table", {"class": "vf-result"})
-            
-            if not results_table:
-                logger.warning("Could not find results table")
-                # Try to find any table with torrent links
-                tables = soup.find_all("table")
-                for table in tables:
-                    if table.find("a", href=lambda x: x and "viewtopic.php?t=" in str(x)):
-                        results_table = table
-                        break
-            
-            if not results_table:
+            tree = lxml_html.fromstring(content)
+
+            # Find result rows inside the results table - rutracker uses
+            # specific table classes/ids; XPath keeps the walk in C
+            rows = tree.xpath(
+                "//table[@id='tor-tbl' or contains(@class,'forumline') or contains(@class,'vf-result')]"
+                "//tr[contains(@class,'tCenter') or contains(@class,'hl-tr')]"
+            )
+
+            if not rows:
+                # Fall back to any row containing a topic link
+                rows = tree.xpath("//tr[.//a[contains(@href,'viewtopic.php?t=')]]")
+
+            if not rows:
                 logger.warning("No torrent results found on page")
                 return results
-            
-            # Find all result rows
-            rows = results_table.find_all("tr", class_=lambda x: x and ("tCenter" in x or "hl-tr" in x), limit=max_results * 2)
-            
+
             for row in rows[:max_results]:
                 try:
                     torrent = self._parse_torrent_row(row)
                     if torrent and torrent.title:  # Only add if we have a valid title
                         results.append(torrent)
                 except Exception as e:
-                    logger.debug(f"Failed to parse torrent row: {e}")
+                    logger.debug("Failed to parse torrent row: %s", e)
                     continue
-            
+
+            # Fetch magnet links concurrently - each one is an independent
+            # blocking GET, so a thread pool collapses N round-trips into ~1
+            self._fill_magnet_links(results)
+
         except Exception as e:
             logger.error(f"Error parsing search results: {e}", exc_info=True)
-        
+
         return results
+
+    def _fill_magnet_links(self, results: List[TorrentResult]) -> None:
+        """
+        Populate magnet links for search results using a thread pool.
+
+        requests.Session is thread-safe for separate requests; concurrency
+        is capped at 8 to stay polite to rutracker.
+
+        Args:
+            results: TorrentResult objects to update in place
+        """
+        pending = []
+        for result in results:
+            if result.url and "t=" in result.url:
+                topic_id = result.url.split("t=")[1].split("&")[0]
+                pending.append((result, topic_id))
+
+        if not pending:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(8, len(pending))) as executor:
+            futures = {
+                executor.submit(self._get_magnet_link, topic_id): result
+                for result, topic_id in pending
+            }
+            for future in as_completed(futures):
+                result = futures[future]
+                try:
+                    result.magnet = future.result()
+                except Exception as e:
+                    logger.debug("Could not get magnet link for %s: %s", result.url, e)
     
     def _parse_torrent_row(self, row) -> Optional[TorrentResult]:
         """
         Parse a single torrent row from search results.
-        
+
         Args:
-            row: BeautifulSoup row element
-            
+            row: lxml row element
+
         Returns:
             TorrentResult object or None if parsing fails
         """
         try:
             # Find title cell (usually contains link)
-            title_link = row.find("a", href=lambda x: x and "viewtopic.php?t=" in str(x), class_="med") or \
-                        row.find("a", href=lambda x: x and "viewtopic.php?t=" in str(x))
-            
-            if not title_link:
+            links = row.xpath(".//a[contains(@href,'viewtopic.php?t=') and contains(@class,'med')]") or \
+                    row.xpath(".//a[contains(@href,'viewtopic.php?t=')]")
+
+            if not links:
                 return None
-            
-            title = title_link.get_text(strip=True)
+
+            title_link = links[0]
+            title = title_link.text_content().strip()
             url = urljoin(self.BASE_URL, title_link.get("href", ""))
-            
+
             # Extract topic ID from URL
             topic_id = None
             if "t=" in url:
                 topic_id = url.split("t=")[1].split("&")[0]
-            
-            # Extract size, seeders, leechers from other cells
-            cells = row.find_all("td")
+
+            # Rutracker's column schema is fixed, so hit the known cell
+            # classes directly instead of scanning every <td> in Python
             size = None
             seeders = None
             leechers = None
-            
-            for cell in cells:
-                text = cell.get_text(strip=True)
-                
-                # Size is usually in a specific column or contains "GB", "MB", etc.
-                if any(unit in text.upper() for unit in ["GB", "MB", "KB", "TB", "ГБ", "МБ", "КБ", "ТБ"]) and not size:
-                    size = text
-                
-                # Seeders and leechers are usually numbers in specific columns
-                if text.isdigit():
-                    num = int(text)
-                    if seeders is None:
-                        seeders = num
-                    elif leechers is None and num != seeders:
-                        leechers = num
-            
-            # Get magnet link from torrent page
-            magnet = None
-            if topic_id:
-                try:
-                    magnet = self._get_magnet_link(topic_id)
-                except Exception as e:
-                    logger.debug(f"Could not get magnet link for topic {topic_id}: {e}")
-            
+
+            size_text = row.xpath("string(./td[contains(@class,'tor-size')])").strip()
+            seed_text = row.xpath("string(./td[contains(@class,'seedmed')])").strip()
+            leech_text = row.xpath("string(./td[contains(@class,'leechmed')])").strip()
+
+            if size_text:
+                size = size_text.replace('\xa0', ' ').rstrip('↓ ').strip()
+            if seed_text.isdigit():
+                seeders = int(seed_text)
+            if leech_text.isdigit():
+                leechers = int(leech_text)
+
+            if size is None and seeders is None and leechers is None:
+                # Unexpected markup - fall back to a single pass over the
+                # cells with one regex match per cell for the size
+                for cell in row.xpath("./td"):
+                    text = cell.text_content().strip()
+                    if size is None and _UNIT_RE.search(text):
+                        size = text
+                    elif text.isdigit():
+                        num = int(text)
+                        if seeders is None:
+                            seeders = num
+                        elif leechers is None and num != seeders:
+                            leechers = num
+            
+            # Magnet link is filled in later by _parse_search_results so the
+            # per-topic page fetches can run concurrently
             return TorrentResult(
                 title=title,
                 size=size,
                 seeders=seeders,
                 leechers=leechers,
                 url=url,
-                magnet=magnet,
+                magnet=None,
                 download_url=None
             )
             
         except Exception as e:
-            logger.debug(f"Error parsing torrent row: {e}")
+            logger.debug("Error parsing torrent row: %s", e)
             return None
     
     def _get_magnet_link(self, topic_id: str) -> Optional[str]:
         """
-        Get magnet link for a torrent topic.
-        
+        Get magnet link for a torrent topic, caching results per topic.
+
+        The magnet for a given topic is stable, so repeat searches reuse
+        the cached value instead of re-fetching the topic page.
+
         Args:
             topic_id: Topic ID of the torrent
-            
+
+        Returns:
+            Magnet link or None if not found
+        """
+        cached = self._magnet_cache.get(topic_id)
+        if cached and time.monotonic() - cached[0] < self.MAGNET_CACHE_TTL:
+            return cached[1]
+
+        magnet = self._fetch_magnet_link(topic_id)
+        if magnet:
+            if len(self._magnet_cache) >= self.MAGNET_CACHE_MAX:
+                self._magnet_cache.clear()
+            self._magnet_cache[topic_id] = (time.monotonic(), magnet)
+        return magnet
+
+    def _fetch_magnet_link(self, topic_id: str) -> Optional[str]:
+        """
+        Fetch the magnet link for a torrent topic from its page.
+
+        Args:
+            topic_id: Topic ID of the torrent
+
         Returns:
             Magnet link or None if not found
         """
@@ -282,9 +397,18 @@ class RutrackerScraper:
             topic_url = f"{self.BASE_URL}/forum/viewtopic.php?t={topic_id}"
             response = self.session.get(topic_url, timeout=10)
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, "html.parser")
-            
+
+            # Fast path: topic pages normally carry exactly one magnet URI,
+            # so a raw bytes scan avoids building a parse tree at all
+            idx = response.content.find(b'magnet:?')
+            if idx != -1:
+                match = _MAGNET_RE_BYTES.match(response.content, idx)
+                if match:
+                    # Hrefs escape '&' as '&amp;' in the raw HTML
+                    return match.group(0).decode('ascii', 'ignore').replace('&amp;', '&')
+
+            soup = _parse_html(response, parse_only=_LINK_SCRIPT_STRAINER)
+
             # Find magnet link
             magnet_link = soup.find("a", href=lambda x: x and x.startswith("magnet:"))
             if magnet_link:
@@ -294,15 +418,14 @@ class RutrackerScraper:
             scripts = soup.find_all("script")
             for script in scripts:
                 if script.string and "magnet:" in script.string:
-                    import re
-                    match = re.search(r'magnet:\?[^\s"\']+', script.string)
+                    match = _MAGNET_RE.search(script.string)
                     if match:
                         return match.group(0)
             
             return None
             
         except Exception as e:
-            logger.debug(f"Error getting magnet link: {e}")
+            logger.debug("Error getting magnet link: %s", e)
             return None
     
     def get_torrent_download_url(self, torrent_url: str) -> Optional[str]:
@@ -319,7 +442,7 @@ class RutrackerScraper:
             response = self.session.get(torrent_url, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = _parse_html(response, parse_only=_LINK_STRAINER)
             
             # Look for magnet link first
             magnet_link = soup.find("a", href=lambda x: x and x.startswith("magnet:"))
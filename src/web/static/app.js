@@ -635,12 +635,26 @@ function connectWebSocket() {
         errorEl.style.display = 'none';
     });
     
-    // Receive torrent updates
+    // Receive torrent updates (full snapshot, sent on connect)
     socket.on('torrents_update', (data) => {
         const torrents = data.torrents || [];
         window.lastTorrents = torrents; // Store for filtering
         updateTorrentsList(torrents);
     });
+
+    // Receive incremental updates (changed fields/removed hashes); new
+    // torrents arrive as full entries, known ones as partial deltas
+    socket.on('torrents_patch', (data) => {
+        const byHash = new Map((window.lastTorrents || []).map(t => [t.hash, t]));
+        (data.changed || []).forEach(t => {
+            const existing = byHash.get(t.hash);
+            byHash.set(t.hash, existing ? Object.assign({}, existing, t) : t);
+        });
+        (data.removed || []).forEach(h => byHash.delete(h));
+        const torrents = Array.from(byHash.values());
+        window.lastTorrents = torrents;
+        updateTorrentsList(torrents);
+    });
     
     // Connection error
     socket.on('connect_error', (error) => {
@@ -1033,13 +1047,24 @@ async function showFileModal(hash) {
         if (chatId) {
             headers['X-Chat-ID'] = chatId;
         }
-        const response = await fetch(`/api/torrents/${hash}/files?_auth=${encodeURIComponent(initData)}`, {
+        const response = await fetch(`/api/torrents/${hash}/files?compact=1&_auth=${encodeURIComponent(initData)}`, {
             headers: headers
         });
         const data = await response.json();
-        
-        if (data.files) {
-            currentTorrentFiles = data.files;
+
+        // compact=1 sends one columns header plus value rows; expand back
+        // into per-file objects (plain {files: [...]} still supported)
+        let files = data.files;
+        if (!files && data.columns && data.rows) {
+            files = data.rows.map(row => {
+                const obj = {};
+                data.columns.forEach((col, i) => { obj[col] = row[i]; });
+                return obj;
+            });
+        }
+
+        if (files) {
+            currentTorrentFiles = files;
             currentTorrentHash = hash;
             
             // Get torrent name for title
@@ -1048,7 +1073,7 @@ async function showFileModal(hash) {
             const torrentName = torrentCard?.querySelector('.torrent-name')?.textContent || 'Torrent';
             title.textContent = `Files: ${torrentName.substring(0, 40)}${torrentName.length > 40 ? '...' : ''}`;
             
-            renderFileList(data.files);
+            renderFileList(files);
         } else {
             fileList.innerHTML = `<div class="error">❌ ${data.error || 'Failed to load files'}</div>`;
         }
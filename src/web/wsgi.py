@@ -0,0 +1,32 @@
+"""WSGI entry point for serving the web app standalone under gunicorn.
+
+The usual deployment embeds the web server in the bot process (see
+src/main.py). This module lets the web tier run in its own process
+instead, e.g.:
+
+    gunicorn -k eventlet -w 1 src.web.wsgi:application
+
+Keep a single worker unless SOCKETIO_MESSAGE_QUEUE points at a broker
+(e.g. redis://localhost:6379/0): without one, broadcasts only reach
+clients connected to the worker that emits them.
+"""
+import os
+
+# Patch the stdlib before anything imports socket/ssl/threading so every
+# blocking call in the web stack cooperates with the eventlet hub. This
+# is safe here because this process serves only the web tier; it must
+# NOT move into server.py, which is also imported by the bot process
+# where python-telegram-bot owns an unpatched asyncio loop. Gunicorn's
+# eventlet worker patches on its own, so this is a no-op under it.
+if os.getenv('SOCKETIO_ASYNC_MODE', 'eventlet') == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+
+from src.web.server import app, broadcast_torrents, socketio
+
+# flask-socketio middleware already wraps the Flask app, so exposing it
+# directly gives gunicorn both HTTP and Socket.IO handling
+application = app
+
+# The broadcast loop must run inside the serving worker
+socketio.start_background_task(broadcast_torrents)